@@ -1,39 +1,145 @@
 #!/usr/bin/env python3
 
+import argparse
+import hashlib
+import itertools
 import os
-import subprocess
+import queue
 import sys
-from pathlib import Path
-from typing import Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import boto3
+from boto3.s3.transfer import (
+    ProgressCallbackInvoker,
+    TransferConfig,
+    create_transfer_manager,
+)
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from dotenv import load_dotenv
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import BarColumn, Progress, TextColumn, TransferSpeedColumn
+from s3transfer.utils import S3_RETRYABLE_DOWNLOAD_ERRORS
 
-# Initialize Rich console
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
+    from s3transfer.processpool import ProcessPoolDownloader
 
+# AWS settings that must be provided by the environment or the .env file
+REQUIRED_AWS_VARS = ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_DEFAULT_REGION")
 
-def is_root() -> bool:
-    """Check if the script is running with root privileges."""
-    return os.geteuid() == 0
+# A listed S3 object: (key, size, ETag)
+ObjectInfo = Tuple[str, int, str]
 
+# Rich console, created on first use
+console: Optional["Console"] = None
 
-def run_with_sudo() -> None:
-    """Re-run the script with sudo privileges."""
-    if not is_root():
-        console.print("[yellow]Requesting sudo privileges...[/yellow]")
-        try:
-            # Get the absolute path of the current script
-            script_path = os.path.abspath(sys.argv[0])
-            # Re-run the script with sudo
-            os.execvp("sudo", ["sudo", sys.executable, script_path] + sys.argv[1:])
-        except Exception as e:
-            console.print(f"[red]Failed to obtain sudo privileges: {str(e)}[/red]")
-            sys.exit(1)
+# Number of objects downloaded concurrently
+MAX_WORKERS = 64
+
+# Maximum number of objects waiting between two pipeline stages
+QUEUE_SIZE = 10_000
+
+# Number of threads checking local files before download
+CHECK_WORKERS = 16
+
+# Number of sub-prefixes listed concurrently
+LIST_WORKERS = 32
+
+# Keys requested per ListObjectsV2 call; 1000 is the S3 maximum
+LIST_PAGE_SIZE = 1000
+
+# Maximum number of listed pages waiting to be consumed
+PAGE_QUEUE_SIZE = 2 * LIST_WORKERS
+
+# Seconds between stop checks while waiting on a listing queue
+QUEUE_POLL_INTERVAL = 0.1
+
+# Minimum number of seconds between progress bar updates
+PROGRESS_INTERVAL = 0.1
+
+# Seconds between status lines in quiet mode
+METER_INTERVAL = 1.0
+
+MB = 1024 * 1024
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Multipart settings for the transfer manager shared by all workers
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=8 * MB,
+    max_concurrency=max(MAX_WORKERS, (os.cpu_count() or 1) * 4),
+    max_io_queue=1000,
+    use_threads=True,
+)
+
+# Read size when streaming small objects straight to disk
+STREAM_CHUNK_SIZE = 1 * MB
+
+# One pooled connection per possible in-flight request, with adaptive retries
+CLIENT_CONFIG = Config(
+    max_pool_connections=(
+        MAX_WORKERS + TRANSFER_CONFIG.max_request_concurrency + LIST_WORKERS
+    ),
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+    signature_version="s3v4",
+)
+
+# S3 client shared by listing and downloads, created on first use
+s3_client = None
+
+# Directories already created during this run, so each one is only created once
+created_dirs: Set[str] = set()
+dir_conflict_lock = threading.Lock()
+
+# Counter for temporary file names, unique within the process
+file_suffixes = itertools.count()
+
+
+def get_console() -> "Console":
+    """Get the shared Rich console, creating it on first use."""
+    global console
+    if console is None:
+        from rich.console import Console
+
+        console = Console()
+    return console
+
+
+def get_s3_client():
+    """Get the shared S3 client, creating it on first use."""
+    global s3_client
+    if s3_client is None:
+        session = boto3.Session()
+        s3_client = session.client("s3", config=CLIENT_CONFIG)
+    return s3_client
+
+
+def is_writable(local_path: str) -> bool:
+    """Check whether the local path can be written to by the current user."""
+    # The sync creates missing directories, so check the nearest existing one
+    path = os.path.abspath(local_path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return os.access(path, os.W_OK)
 
 
 def get_home_dir() -> str:
@@ -41,218 +147,770 @@ def get_home_dir() -> str:
     return os.path.expanduser("~")
 
 
-def load_environment() -> None:
-    """Load environment variables from .env file if it exists."""
-    env_path = Path(".env")
-    if env_path.exists():
-        load_dotenv()
-        console.print("[green]Loaded environment variables from .env file[/green]")
-    else:
-        console.print(
-            "[yellow]No .env file found. Please create one with your AWS credentials.[/yellow]"
-        )
-        console.print("Required environment variables:")
-        console.print("  AWS_ACCESS_KEY_ID")
-        console.print("  AWS_SECRET_ACCESS_KEY")
-        console.print("  AWS_DEFAULT_REGION")
-        sys.exit(1)
+@lru_cache(maxsize=1)
+def load_aws_environment() -> Dict[str, str]:
+    """Load and validate the AWS settings once; the environment overrides .env."""
+    from dotenv import load_dotenv
 
+    # load_dotenv reports whether the file was found and loaded, so a
+    # separate existence check is not needed
+    env_loaded = load_dotenv(".env", override=False)
+    if env_loaded:
+        get_console().print(
+            "[green]Loaded environment variables from .env file[/green]"
+        )
 
-def validate_aws_credentials() -> None:
-    """Validate AWS credentials from environment variables."""
-    required_vars = ["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_DEFAULT_REGION"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-
+    missing_vars = [var for var in REQUIRED_AWS_VARS if not os.getenv(var)]
     if missing_vars:
-        console.print(
-            f"[red]Missing required AWS environment variables: {', '.join(missing_vars)}[/red]"
-        )
-        console.print(
-            "[yellow]Please update your .env file with the required credentials.[/yellow]"
-        )
+        if not env_loaded:
+            get_console().print(
+                "[yellow]No .env file found. Please create one with your AWS credentials.[/yellow]"
+            )
+            get_console().print("Required environment variables:")
+            for var in REQUIRED_AWS_VARS:
+                get_console().print(f"  {var}")
+        else:
+            get_console().print(
+                f"[red]Missing required AWS environment variables: {', '.join(missing_vars)}[/red]"
+            )
+            get_console().print(
+                "[yellow]Please update your .env file with the required credentials.[/yellow]"
+            )
         sys.exit(1)
 
+    return {var: os.environ[var] for var in REQUIRED_AWS_VARS}
+
 
+@lru_cache(maxsize=1024)
 def parse_s3_path(s3_path: str) -> Tuple[str, Optional[str]]:
     """Parse S3 path into bucket and prefix."""
     if not s3_path.startswith("s3://"):
         raise ValueError("S3 path must start with 's3://'")
 
-    path = s3_path[5:]  # Remove 's3://'
-    parts = path.split("/", 1)
-    bucket = parts[0]
-    prefix = parts[1] if len(parts) > 1 else None
+    bucket, sep, prefix = s3_path[5:].partition("/")  # Remove 's3://'
+    return bucket, prefix if sep else None
 
-    return bucket, prefix
+
+def format_size(size_bytes: int) -> str:
+    """Format file size in human-readable format."""
+    # Each unit is 2**10 times the previous one, so the bit length of the size
+    # picks the unit directly
+    unit = min(max(size_bytes.bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit * 10)):.2f} {SIZE_UNITS[unit]}"
 
 
-def get_file_size(s3_path: str) -> int:
-    """Get the size of a file in S3 in bytes."""
+def put_unless_stopped(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up once stop is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=QUEUE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def list_prefix(
+    s3_client,
+    bucket: str,
+    prefix: str,
+    page_queue: "queue.Queue[Optional[List[ObjectInfo]]]",
+    stop: threading.Event,
+) -> None:
+    """List a prefix into page_queue, ending with None; failures set stop."""
     try:
-        result = subprocess.run(
-            ["aws", "s3", "ls", s3_path], capture_output=True, text=True, check=True
-        )
-        # Parse the size from the ls output
-        parts = result.stdout.strip().split()
-        if len(parts) >= 3:
-            return int(parts[2])  # Size is the third column
-        return 0
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": LIST_PAGE_SIZE},
+        ):
+            if not put_unless_stopped(
+                page_queue,
+                [
+                    (obj["Key"], obj["Size"], obj["ETag"])
+                    for obj in page.get("Contents", ())
+                ],
+                stop,
+            ):
+                return
     except Exception:
-        return 0
+        stop.set()
+        raise
+    finally:
+        put_unless_stopped(page_queue, None, stop)
+
+
+def list_objects(s3_client, bucket: str, prefix: Optional[str]) -> Iterator[ObjectInfo]:
+    """Yield objects under a prefix, listing each sub-prefix concurrently."""
+    # Use empty string instead of None for prefix
+    prefix = prefix or ""
+    paginator = s3_client.get_paginator("list_objects_v2")
+
+    sub_prefixes = []
+    for page in paginator.paginate(
+        Bucket=bucket,
+        Prefix=prefix,
+        Delimiter="/",
+        PaginationConfig={"PageSize": LIST_PAGE_SIZE},
+    ):
+        for obj in page.get("Contents", ()):
+            yield obj["Key"], obj["Size"], obj["ETag"]
+        for common_prefix in page.get("CommonPrefixes", ()):
+            sub_prefixes.append(common_prefix["Prefix"])
+
+    # Without sub-prefixes the delimiter listing above was the whole listing
+    if not sub_prefixes:
+        return
+
+    page_queue = queue.Queue(maxsize=PAGE_QUEUE_SIZE)
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                list_prefix, s3_client, bucket, sub_prefix, page_queue, stop
+            )
+            for sub_prefix in sub_prefixes
+        ]
+        try:
+            remaining = len(futures)
+            while remaining:
+                try:
+                    page = page_queue.get(timeout=QUEUE_POLL_INTERVAL)
+                except queue.Empty:
+                    # Shards stopped by a failed sibling may never queue
+                    # their end marker
+                    if stop.is_set():
+                        break
+                    continue
+                if page is None:
+                    remaining -= 1
+                    continue
+                yield from page
+        finally:
+            # Let the remaining shards stop early if the caller gave up
+            stop.set()
 
+        # Re-raise any listing error from the shards
+        for future in futures:
+            future.result()
 
-def format_size(size_bytes: int) -> str:
-    """Format file size in human-readable format."""
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
 
+def unique_suffix() -> str:
+    """Return a file name suffix that is unique to this process."""
+    return f"{os.getpid():x}.{next(file_suffixes):x}"
+
+
+def ensure_dir(path: str) -> None:
+    """Create a directory once per run, moving aside a file in its place."""
+    if path in created_dirs:
+        return
 
-def sync_s3_to_local(s3_path: str, local_path: str) -> None:
-    """Sync S3 path to local directory with progress tracking using boto3."""
     try:
-        # Create local directory if it doesn't exist
-        os.makedirs(local_path, exist_ok=True)
+        os.makedirs(path, exist_ok=True)
+    except FileExistsError:
+        # A file is in the way of the directory. Workers sharing the
+        # directory may race here, so only one of them moves it aside.
+        with dir_conflict_lock:
+            if not os.path.isdir(path):
+                # Create a unique backup path. Backups outlive the run, so
+                # the name must not repeat across runs.
+                backup_path = f"{path}.{os.urandom(4).hex()}.bak"
+                os.rename(path, backup_path)
+                get_console().print(
+                    f"[yellow]Renamed conflicting file to {backup_path}[/yellow]"
+                )
+            os.makedirs(path, exist_ok=True)
+    created_dirs.add(path)
+
+
+class ThrottledProgress:
+    """Thread-safe progress callback that batches updates to a Rich task."""
+
+    __slots__ = (
+        "progress",
+        "task",
+        "pending",
+        "total",
+        "filename",
+        "last_update",
+        "lock",
+    )
+
+    def __init__(self, progress: "Progress", task) -> None:
+        self.progress = progress
+        self.task = task
+        self.pending = 0
+        self.total: Optional[int] = None
+        self.filename: Optional[str] = None
+        self.last_update = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, bytes_transferred: int) -> None:
+        with self.lock:
+            self.pending += bytes_transferred
+        self.maybe_flush()
+
+    def set_total(self, total: int) -> None:
+        """Set the total number of bytes to sync, as known so far."""
+        with self.lock:
+            self.total = total
+        self.maybe_flush()
+
+    def set_filename(self, filename: str) -> None:
+        """Show a filename with the next progress update."""
+        self.filename = filename
+
+    def maybe_flush(self) -> None:
+        """Flush if PROGRESS_INTERVAL has passed since the last update."""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_update < PROGRESS_INTERVAL:
+                return
+            self.last_update = now
+        self.flush()
+
+    def flush(self) -> None:
+        """Hand any accumulated updates to the progress task."""
+        with self.lock:
+            advance, self.pending = self.pending, 0
+            total, self.total = self.total, None
+            filename, self.filename = self.filename, None
+        fields = {"filename": filename} if filename is not None else {}
+        if total is not None:
+            fields["total"] = total
+        self.progress.update(self.task, advance=advance, **fields)
+
+    def complete(self, total_size: int) -> None:
+        """Mark the progress task as complete."""
+        self.flush()
+        self.progress.update(
+            self.task, total=total_size, completed=total_size, filename=""
+        )
 
-        # Parse S3 path
-        bucket, prefix = parse_s3_path(s3_path)
 
-        # Initialize S3 client
-        s3_client = boto3.client("s3")
+class ThroughputMeter:
+    """Byte counter printed every METER_INTERVAL seconds instead of a live bar."""
 
-        # List all objects in the S3 path
-        console.print("[cyan]Listing objects in S3 path...[/cyan]")
-        paginator = s3_client.get_paginator("list_objects_v2")
+    def __init__(self) -> None:
+        self.done = 0
+        self.total = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.started_at = time.monotonic()
+        self.reporter = threading.Thread(target=self.report, daemon=True)
 
-        # Use empty string instead of None for prefix
-        list_kwargs = {"Bucket": bucket}
-        if prefix is not None:
-            list_kwargs["Prefix"] = prefix
+    def __enter__(self) -> "ThroughputMeter":
+        self.reporter.start()
+        return self
 
-        pages = paginator.paginate(**list_kwargs)
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
 
-        # Get total size and count of objects
-        total_size = 0
-        total_objects = 0
-        objects = []
+    def stop(self) -> None:
+        """Stop the reporter thread."""
+        self.stopped.set()
+        self.reporter.join()
 
-        for page in pages:
-            if "Contents" in page:
-                for obj in page["Contents"]:
-                    size = obj["Size"]
-                    key = obj["Key"]
-                    total_size += size
-                    total_objects += 1
-                    objects.append((key, size))
+    def __call__(self, bytes_transferred: int) -> None:
+        with self.lock:
+            self.done += bytes_transferred
 
-        if total_objects == 0:
-            console.print("[yellow]No objects found in the specified S3 path.[/yellow]")
-            return
+    def set_total(self, total: int) -> None:
+        """Set the total number of bytes to sync, as known so far."""
+        self.total = total
+
+    def set_filename(self, filename: str) -> None:
+        """Filenames are not reported by the meter."""
+
+    def report(self) -> None:
+        """Print a status line periodically until stopped."""
+        while not self.stopped.wait(METER_INTERVAL):
+            self.print_status()
+
+    def print_status(self) -> None:
+        """Print the bytes synced so far and the average rate."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        get_console().print(
+            f"[cyan]{format_size(self.done)} / {format_size(self.total)} "
+            f"({format_size(int(self.done / elapsed))}/s)[/cyan]"
+        )
 
-        console.print(
-            f"[cyan]Found {total_objects} objects to sync (total size: {format_size(total_size)})[/cyan]"
+    def complete(self, total_size: int) -> None:
+        """Print the final status line."""
+        # Stop the reporter first so it cannot print over the final line
+        self.stop()
+        self.total = total_size
+        self.print_status()
+
+
+# Receives transfer progress: a live Rich bar or the quiet throughput meter
+ProgressTracker = Union[ThrottledProgress, ThroughputMeter]
+
+
+def preallocate(f: BinaryIO, size: int) -> None:
+    """Reserve disk space for a file about to be written, where supported."""
+    if size > 0 and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            pass
+
+
+@contextmanager
+def open_download_target(local_file_path: str, size: int) -> Iterator[BinaryIO]:
+    """Open a pre-sized temporary file that replaces local_file_path on success."""
+    temp_path = f"{local_file_path}.{unique_suffix()}.part"
+    try:
+        with open(temp_path, "wb") as f:
+            preallocate(f, size)
+            yield f
+        os.replace(temp_path, local_file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def stream_object(
+    s3_client,
+    bucket: str,
+    key: str,
+    size: int,
+    local_file_path: str,
+    callback: ProgressTracker,
+) -> None:
+    """Download an object with a single GET, writing its body straight to disk."""
+    attempts = TRANSFER_CONFIG.num_download_attempts
+    with open_download_target(local_file_path, size) as f:
+        for attempt in range(1, attempts + 1):
+            written = 0
+            response = None
+            try:
+                response = s3_client.get_object(Bucket=bucket, Key=key)
+                f.seek(0)
+                for chunk in response["Body"].iter_chunks(STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+                    callback(len(chunk))
+                break
+            except S3_RETRYABLE_DOWNLOAD_ERRORS:
+                # Release the failed connection and undo the partial progress
+                # before retrying
+                if response is not None:
+                    response["Body"].close()
+                callback(-written)
+                if attempt == attempts:
+                    raise
+
+        # Drop any preallocated space beyond the data actually received
+        f.truncate(written)
+
+
+def md5_file(path: str) -> str:
+    """Compute the hex MD5 digest of a local file."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_up_to_date(
+    local_file_path: str, size: int, etag: str, verify_etag: bool = False
+) -> bool:
+    """Check whether a local file already matches the listed S3 object."""
+    try:
+        if os.stat(local_file_path).st_size != size:
+            return False
+    except (FileNotFoundError, NotADirectoryError):
+        # A file where a parent directory should be is moved aside by
+        # ensure_dir() before the download
+        return False
+
+    # Multipart ETags (containing "-") are not MD5s of the content, so those
+    # objects are compared by size only
+    etag = etag.strip('"')
+    if verify_etag and "-" not in etag:
+        return md5_file(local_file_path) == etag
+    return True
+
+
+def download_object(
+    s3_client,
+    transfer_manager,
+    process_downloader: Optional["ProcessPoolDownloader"],
+    bucket: str,
+    key: str,
+    size: int,
+    local_file_path: str,
+    callback: ProgressTracker,
+) -> None:
+    """Download a single S3 object, advancing the shared progress task."""
+    if key.endswith("/"):
+        # Directory markers have no content; download_worker already created
+        # the directory
+        callback(size)
+        return
+
+    # The process pool's fallocate fails on empty files, so those are streamed
+    if process_downloader is not None and size > 0:
+        # Worker processes cannot report partial progress back, so the
+        # object's bytes are counted once it has finished
+        process_downloader.download_file(
+            bucket, key, local_file_path, expected_size=size
+        ).result()
+        callback(size)
+        return
+
+    if size < TRANSFER_CONFIG.multipart_threshold:
+        stream_object(s3_client, bucket, key, size, local_file_path, callback)
+        return
+
+    with open_download_target(local_file_path, size) as f:
+        future = transfer_manager.download(
+            bucket,
+            key,
+            f,
+            subscribers=[ProgressCallbackInvoker(callback)],
         )
+        future.result()
+        f.truncate(future.meta.size)
+
+
+def check_worker(
+    check_queue: "queue.Queue[Optional[ObjectInfo]]",
+    download_queue: "queue.Queue[Optional[Tuple[str, int, str]]]",
+    prefix: Optional[str],
+    local_path: str,
+    callback: ProgressTracker,
+    stop: threading.Event,
+    force: bool = False,
+    verify_etag: bool = False,
+) -> Tuple[int, int]:
+    """Forward objects that are not up to date to download_queue, until None arrives."""
+    skipped = 0
+    failed = 0
+    while True:
+        item = check_queue.get()
+        if item is None:
+            return skipped, failed
+        if stop.is_set():
+            # Keep draining so that the listing thread never blocks on a
+            # full queue
+            continue
+        key, size, etag = item
+
+        # Calculate local path for the object
+        relative_path = key[len(prefix) :] if prefix else key
+        local_file_path = os.path.join(local_path, relative_path)
 
-        # Initialize progress tracking
-        with Progress(
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TextColumn("•"),
-            TransferSpeedColumn(),
-            TextColumn("•"),
-            TextColumn("[cyan]{task.fields[filename]}"),
-            console=console,
-        ) as progress:
-            # Create a task for overall progress
-            task = progress.add_task(
-                "[cyan]Syncing files...", total=total_size, filename=""
+        try:
+            if not force and is_up_to_date(local_file_path, size, etag, verify_etag):
+                callback(size)
+                skipped += 1
+                continue
+        except OSError as e:
+            get_console().print(
+                f"[red]Error checking {local_file_path}: {str(e)}[/red]"
             )
+            failed += 1
+            continue
+
+        download_queue.put((key, size, local_file_path))
+
+
+def download_worker(
+    download_queue: "queue.Queue[Optional[Tuple[str, int, str]]]",
+    s3_client,
+    transfer_manager,
+    process_downloader: Optional["ProcessPoolDownloader"],
+    bucket: str,
+    callback: ProgressTracker,
+    stop: threading.Event,
+) -> int:
+    """Download queued objects until None arrives, returning the number that failed."""
+    failed = 0
+    while True:
+        item = download_queue.get()
+        if item is None:
+            return failed
+        if stop.is_set():
+            continue
+        key, size, local_file_path = item
+
+        # Ensure the parent directory exists
+        parent_dir = os.path.dirname(local_file_path)
+        if parent_dir:
+            try:
+                ensure_dir(parent_dir)
+            except OSError as e:
+                get_console().print(
+                    f"[red]Error creating directory {parent_dir}: {str(e)}[/red]"
+                )
+                failed += 1
+                continue
 
-            # Download each object
-            for key, size in objects:
-                # Calculate local path for the object
-                relative_path = key[len(prefix) :] if prefix else key
-                local_file_path = os.path.join(local_path, relative_path)
-
-                # Ensure the parent directory exists
-                parent_dir = os.path.dirname(local_file_path)
-                if parent_dir:
-                    try:
-                        # First, check if the parent directory exists and is a file
-                        if os.path.exists(parent_dir) and not os.path.isdir(parent_dir):
-                            # Create a unique backup path
-                            backup_path = f"{parent_dir}.{os.urandom(4).hex()}.bak"
-                            os.rename(parent_dir, backup_path)
-                            console.print(
-                                f"[yellow]Renamed conflicting file to {backup_path}[/yellow]"
-                            )
-
-                        # Now create the directory
-                        os.makedirs(parent_dir, exist_ok=True)
-                    except OSError as e:
-                        console.print(
-                            f"[red]Error creating directory {parent_dir}: {str(e)}[/red]"
-                        )
-                        continue
-
-                # Update progress with current filename
-                progress.update(task, filename=os.path.basename(key))
-
-                # Download the object with progress tracking
-                try:
-                    s3_client.download_file(
-                        bucket,
-                        key,
-                        local_file_path,
-                        Callback=lambda bytes_transferred: progress.update(
-                            task, advance=bytes_transferred
-                        ),
+        try:
+            download_object(
+                s3_client,
+                transfer_manager,
+                process_downloader,
+                bucket,
+                key,
+                size,
+                local_file_path,
+                callback,
+            )
+        except Exception as e:
+            get_console().print(f"[red]Error downloading {key}: {str(e)}[/red]")
+            failed += 1
+            continue
+
+        # Update progress with the most recently completed file
+        callback.set_filename(os.path.basename(key))
+
+
+def create_process_downloader() -> "ProcessPoolDownloader":
+    """Create a process pool downloader using the same transfer settings."""
+    from s3transfer.processpool import ProcessPoolDownloader, ProcessTransferConfig
+
+    config = ProcessTransferConfig(
+        multipart_threshold=TRANSFER_CONFIG.multipart_threshold,
+        multipart_chunksize=TRANSFER_CONFIG.multipart_chunksize,
+        max_request_processes=os.cpu_count() or 1,
+    )
+    return ProcessPoolDownloader(
+        client_kwargs={
+            "region_name": load_aws_environment()["AWS_DEFAULT_REGION"],
+            "config": CLIENT_CONFIG,
+        },
+        config=config,
+    )
+
+
+def sync_s3_to_local(
+    s3_path: str,
+    local_path: str,
+    use_process_pool: bool = False,
+    force: bool = False,
+    verify_etag: bool = False,
+    quiet: bool = False,
+) -> None:
+    """Sync S3 path to local directory with progress tracking using boto3.
+
+    Listing, up-to-date checks and downloads run as thread stages joined by
+    bounded queues; the flags mirror the command line options.
+    """
+    try:
+        # Create local directory if it doesn't exist
+        os.makedirs(local_path, exist_ok=True)
+
+        # Parse S3 path
+        bucket, prefix = parse_s3_path(s3_path)
+
+        # Get the shared S3 client
+        s3_client = get_s3_client()
+
+        get_console().print("[cyan]Listing and syncing objects in S3 path...[/cyan]")
+
+        with ExitStack() as stack:
+            # Initialize progress tracking
+            if quiet:
+                callback = stack.enter_context(ThroughputMeter())
+            else:
+                from rich.progress import (
+                    BarColumn,
+                    DownloadColumn,
+                    Progress,
+                    TextColumn,
+                    TimeRemainingColumn,
+                    TransferSpeedColumn,
+                )
+
+                progress = stack.enter_context(
+                    Progress(
+                        TextColumn("[bold blue]{task.description}"),
+                        BarColumn(),
+                        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                        TextColumn("•"),
+                        DownloadColumn(),
+                        TextColumn("•"),
+                        TransferSpeedColumn(),
+                        TextColumn("•"),
+                        TimeRemainingColumn(),
+                        TextColumn("•"),
+                        TextColumn("[cyan]{task.fields[filename]}"),
+                        console=get_console(),
                     )
-                except Exception as e:
-                    console.print(f"[red]Error downloading {key}: {str(e)}[/red]")
-                    continue
+                )
+                # Create a task for overall progress; its total grows as
+                # objects are listed
+                task = progress.add_task("[cyan]Syncing files...", total=0, filename="")
+                callback = ThrottledProgress(progress, task)
+
+            # Get total size and count of objects
+            total_size = 0
+            total_objects = 0
+
+            # Check and download objects concurrently through a single
+            # transfer manager
+            check_queue = queue.Queue(maxsize=QUEUE_SIZE)
+            download_queue = queue.Queue(maxsize=QUEUE_SIZE)
+            stop = threading.Event()
+            transfer_manager = stack.enter_context(
+                create_transfer_manager(s3_client, TRANSFER_CONFIG)
+            )
+            process_downloader = None
+            if use_process_pool:
+                process_downloader = stack.enter_context(create_process_downloader())
+            executor = stack.enter_context(
+                ThreadPoolExecutor(CHECK_WORKERS + MAX_WORKERS)
+            )
+
+            checkers = [
+                executor.submit(
+                    check_worker,
+                    check_queue,
+                    download_queue,
+                    prefix,
+                    local_path,
+                    callback,
+                    stop,
+                    force,
+                    verify_etag,
+                )
+                for _ in range(CHECK_WORKERS)
+            ]
+            downloaders = [
+                executor.submit(
+                    download_worker,
+                    download_queue,
+                    s3_client,
+                    transfer_manager,
+                    process_downloader,
+                    bucket,
+                    callback,
+                    stop,
+                )
+                for _ in range(MAX_WORKERS)
+            ]
+
+            # List all objects in the S3 path, feeding the pipeline as we go
+            try:
+                for obj in list_objects(s3_client, bucket, prefix):
+                    key, size, _ = obj
+                    total_size += size
+                    total_objects += 1
+                    callback.set_total(total_size)
+                    check_queue.put(obj)
+            except BaseException:
+                stop.set()
+                raise
+            finally:
+                # Signal the download workers once every checker has finished
+                for _ in checkers:
+                    check_queue.put(None)
+                wait(checkers)
+                for _ in downloaders:
+                    download_queue.put(None)
+
+            skipped = failed = 0
+            for checker in checkers:
+                checker_skipped, checker_failed = checker.result()
+                skipped += checker_skipped
+                failed += checker_failed
+            failed += sum(downloader.result() for downloader in downloaders)
 
             # Mark progress as complete
-            progress.update(task, completed=total_size, filename="")
+            callback.complete(total_size)
 
-        console.print("[green]Sync completed successfully![/green]")
+        if total_objects == 0:
+            get_console().print(
+                "[yellow]No objects found in the specified S3 path.[/yellow]"
+            )
+            return
+
+        get_console().print(
+            f"[cyan]Found {total_objects} objects (total size: {format_size(total_size)})[/cyan]"
+        )
+        if skipped:
+            get_console().print(
+                f"[cyan]Skipped {skipped} files that were already up to date[/cyan]"
+            )
+        if failed:
+            get_console().print(f"[red]Failed to sync {failed} objects[/red]")
+            sys.exit(1)
+        get_console().print("[green]Sync completed successfully![/green]")
 
     except ClientError as e:
-        console.print(f"[red]AWS Error: {str(e)}[/red]")
+        get_console().print(f"[red]AWS Error: {str(e)}[/red]")
         sys.exit(1)
     except Exception as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Sync files from an S3 path to a local directory.",
+        epilog="Example: python3 s3_sync.py s3://my-bucket/path/to/files /local/path",
+    )
+    parser.add_argument("s3_path", help="S3 path to sync from (s3://bucket/prefix)")
+    parser.add_argument("local_path", help="local directory to sync into")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="print a throughput line every second instead of the live "
+        "progress bar, which is cheaper with many concurrent downloads",
+    )
+    parser.add_argument(
+        "--process-pool",
+        action="store_true",
+        help="download with a pool of worker processes instead of threads; "
+        "useful on many-core hosts where a single process becomes CPU-bound",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="download every object, even if an up-to-date local copy exists",
+    )
+    parser.add_argument(
+        "--verify-etag",
+        action="store_true",
+        help="also compare local MD5 checksums with S3 ETags before skipping a "
+        "file; objects uploaded in multiple parts are compared by size only",
+    )
+    return parser.parse_args()
+
+
 def main():
-    # Request sudo privileges if not already running as root
-    run_with_sudo()
-
-    # Load environment variables
-    load_environment()
-    validate_aws_credentials()
-
-    # Get S3 path and local path from command line arguments
-    if len(sys.argv) != 3:
-        console.print("[red]Usage: python3 s3_sync.py <s3_path> <local_path>[/red]")
-        console.print(
-            "Example: python3 s3_sync.py s3://my-bucket/path/to/files /local/path"
+    # Get S3 path, local path and options from command line arguments
+    args = parse_args()
+    s3_path = args.s3_path
+    local_path = args.local_path
+
+    if not is_writable(local_path):
+        get_console().print(
+            f"[red]Error: Local path {local_path} is not writable. "
+            "Choose another directory or fix its permissions.[/red]"
         )
         sys.exit(1)
 
-    s3_path = sys.argv[1]
-    local_path = sys.argv[2]
+    # Load and validate AWS settings
+    load_aws_environment()
+
+    from rich.panel import Panel
 
     try:
         # Validate S3 path format
         bucket, prefix = parse_s3_path(s3_path)
 
         # Display sync information
-        console.print(
+        get_console().print(
             Panel.fit(
                 f"[bold]S3 Sync Details[/bold]\n"
                 f"Bucket: [cyan]{bucket}[/cyan]\n"
@@ -263,10 +921,17 @@ def main():
         )
 
         # Start the sync process
-        sync_s3_to_local(s3_path, local_path)
+        sync_s3_to_local(
+            s3_path,
+            local_path,
+            use_process_pool=args.process_pool,
+            force=args.force,
+            verify_etag=args.verify_etag,
+            quiet=args.quiet,
+        )
 
     except ValueError as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 